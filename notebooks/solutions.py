@@ -30,7 +30,16 @@ temp["height"] = pix.height
 # =============================================================================
 
 # Cell 16: Insert documents into MongoDB
-insert_result = collection.insert_many(data)
+# Store embeddings as packed float32 binData (~4 KB per vector instead of a BSON
+# array of doubles); $vectorSearch indexes these directly and still accepts plain
+# list query vectors. Set to False to keep the embeddings as arrays.
+STORE_EMBEDDINGS_AS_BINDATA = True
+if STORE_EMBEDDINGS_AS_BINDATA:
+    from bson.binary import Binary, BinaryVectorDtype
+    for doc in data:
+        doc["embedding"] = Binary.from_vector(list(doc["embedding"]), BinaryVectorDtype.FLOAT32)
+# ordered=False lets the server keep going past individual failures and apply writes in parallel
+insert_result = collection.insert_many(data, ordered=False, bypass_document_validation=True)
 
 # =============================================================================
 # SOLUTION 4: Vector Search Index Creation
@@ -111,8 +120,8 @@ tool_images = get_information_for_question_answering(**tool_call.args)
 # SOLUTION 9: MongoDB Memory Implementation
 # =============================================================================
 
-# Cell 38: Create index on session_id
-history_collection.create_index("session_id")
+# Cell 38: Create index on session_id (with timestamp, so history reads need no sort)
+history_collection.create_index([("session_id", 1), ("timestamp", 1)])
 
 # Cell 39: Store chat message
 message = {
@@ -125,7 +134,14 @@ message = {
 history_collection.insert_one(message)
 
 # Cell 40: Retrieve session history
-cursor = history_collection.find({"session_id": session_id}).sort("timestamp", 1)
+cursor = (
+    history_collection.find(
+        {"session_id": session_id},
+        projection={"_id": 0, "role": 1, "type": 1, "content": 1, "timestamp": 1},
+    )
+    .sort("timestamp", 1)
+    .batch_size(200)
+)
 
 # Cell 41: Store conversation components
 store_chat_message(session_id, "user", "text", user_query)
@@ -135,27 +151,155 @@ store_chat_message(session_id, "agent", "text", answer)
 # COMPLETE FUNCTIONS FOR REFERENCE
 # =============================================================================
 
-def complete_get_information_function(user_query: str) -> List[str]:
+# Query embedding cache: repeated queries skip the serverless round-trip.
+# Keyed by SHA-256 of provider, input type and text; vectors stored as float32.
+import functools
+import hashlib
+import os
+import re
+from datetime import datetime
+
+import numpy as np
+from bson.binary import Binary
+from pymongo.errors import DuplicateKeyError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+@functools.lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """Shared HTTP session so serverless calls reuse keep-alive TLS connections"""
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=Retry(total=3, backoff_factor=0.2)),
+    )
+    return session
+
+@functools.lru_cache(maxsize=1)
+def get_embedding_cache():
+    """Return the embedding cache collection, creating its 7-day TTL index on first use"""
+    embedding_cache = mongodb_client[DB_NAME]["embedding_cache"]
+    embedding_cache.create_index("ts", expireAfterSeconds=7 * 24 * 60 * 60)
+    return embedding_cache
+
+@functools.lru_cache(maxsize=1024)
+def _embed(text: str, input_type: str) -> tuple:
+    """Embed text via the serverless endpoint, using the MongoDB cache when possible"""
+    embedding_cache = get_embedding_cache()
+    key = hashlib.sha256(f"{LLM_PROVIDER}\0{input_type}\0{text}".encode()).digest()
+    
+    cached = embedding_cache.find_one({"_id": key})
+    if cached:
+        return tuple(np.frombuffer(cached["vec"], dtype=np.float32).tolist())
+    
+    response = get_session().post(
+        url=SERVERLESS_URL,
+        json={
+            "task": "get_embedding",
+            "data": {"input": text, "input_type": input_type},
+        },
+    )
+    response.raise_for_status()
+    # Round through float32 so a miss returns exactly what a later hit will
+    embedding = np.asarray(response.json()["embedding"], dtype=np.float32)
+    
+    try:
+        embedding_cache.insert_one({
+            "_id": Binary(key),
+            "vec": Binary(embedding.tobytes()),
+            "ts": datetime.now(),
+        })
+    except DuplicateKeyError:
+        pass
+    
+    return tuple(embedding.tolist())
+
+def get_query_embedding(text: str, input_type: str = "query") -> List[float]:
+    """Embed text, reusing results already computed in this session"""
+    return list(_embed(text, input_type))
+
+# Semantic query cache: near-duplicate queries reuse earlier search results.
+# After re-ingesting the PDF, call clear_query_cache() so cached results never
+# point at pages that no longer exist.
+QUERY_CACHE_INDEX = "query_cache_index"
+QUERY_CACHE_MIN_SCORE = 0.97
+
+@functools.lru_cache(maxsize=1)
+def get_query_cache():
+    """Return the query cache collection, creating its 24h TTL and vector search indexes on first use"""
+    if "query_cache" not in mongodb_client[DB_NAME].list_collection_names():
+        mongodb_client[DB_NAME].create_collection("query_cache")
+    query_cache = mongodb_client[DB_NAME]["query_cache"]
+    query_cache.create_index("ts", expireAfterSeconds=24 * 60 * 60)
+    if not list(query_cache.list_search_indexes(QUERY_CACHE_INDEX)):
+        query_cache.create_search_index(
+            model={
+                "name": QUERY_CACHE_INDEX,
+                "type": "vectorSearch",
+                "definition": {
+                    "fields": [
+                        {
+                            "type": "vector",
+                            "path": "embedding",
+                            "numDimensions": 1024,
+                            "similarity": "cosine",
+                        },
+                        {"type": "filter", "path": "limit"},
+                    ]
+                },
+            }
+        )
+    return query_cache
+
+def clear_query_cache():
+    """Drop all cached search results, e.g. after re-ingesting the documents"""
+    get_query_cache().delete_many({})
+
+def lookup_query_cache(query_embedding: List[float], limit: int) -> List[str] | None:
+    """Return cached search results for a near-identical earlier query with the same limit, if any"""
+    pipeline = [
+        {
+            "$vectorSearch": {
+                "index": QUERY_CACHE_INDEX,
+                "path": "embedding",
+                "queryVector": query_embedding,
+                "filter": {"limit": limit},
+                "numCandidates": 20,
+                "limit": 1,
+            }
+        },
+        {"$project": {"_id": 0, "keys": 1, "score": {"$meta": "vectorSearchScore"}}},
+    ]
+    for hit in get_query_cache().aggregate(pipeline):
+        if hit["score"] > QUERY_CACHE_MIN_SCORE:
+            return hit["keys"]
+    return None
+
+def complete_get_information_function(user_query: str, limit: int = 2) -> List[str]:
     """Complete implementation of the vector search function"""
     try:
         show_info(f"🔍 Searching for: {user_query}")
         
-        # Embed the user query
-        response = requests.post(
-            url=SERVERLESS_URL,
-            json={
-                "task": "get_embedding", 
-                "data": {"input": user_query, "input_type": "query"},
-            },
-        )
-        
-        if response.status_code != 200:
-            show_error(f"Embedding API failed: {response.status_code}")
+        # Embed the user query (cached)
+        try:
+            query_embedding = get_query_embedding(user_query)
+        except requests.HTTPError as e:
+            show_error(f"Embedding API failed: {e.response.status_code}")
             return []
         
-        query_embedding = response.json()["embedding"]
         show_success(f"Generated query embedding: {len(query_embedding)} dimensions")
 
+        # Reuse results from a semantically equivalent earlier query; the cache
+        # is an optimization, so any failure just falls through to a fresh search
+        try:
+            cached_keys = lookup_query_cache(query_embedding, limit)
+        except Exception as e:
+            show_info(f"Semantic cache unavailable: {e}")
+            cached_keys = None
+        if cached_keys:
+            show_success(f"Semantic cache hit: {len(cached_keys)} images")
+            return cached_keys
+
         # Vector search pipeline
         pipeline = [
             {
@@ -163,16 +307,15 @@ def complete_get_information_function(user_query: str) -> List[str]:
                     "index": VS_INDEX_NAME,
                     "path": "embedding", 
                     "queryVector": query_embedding,
-                    "numCandidates": 150,
-                    "limit": 2,
+                    # 10-20x limit is enough candidates for good recall
+                    "numCandidates": max(20, limit * 15),
+                    "limit": limit,
                 }
             },
             {
                 "$project": {
                     "_id": 0,
                     "key": 1,
-                    "width": 1,
-                    "height": 1,
                     "score": {"$meta": "vectorSearchScore"},
                 }
             },
@@ -187,17 +330,53 @@ def complete_get_information_function(user_query: str) -> List[str]:
         for i, (key, score) in enumerate(zip(keys, scores)):
             show_info(f"  {i+1}. {key} (score: {score:.4f})")
         
+        # Only cache real results; an empty list would mask similar queries for 24h
+        if keys:
+            try:
+                get_query_cache().insert_one(
+                    {"embedding": query_embedding, "limit": limit, "keys": keys, "ts": datetime.now()}
+                )
+            except Exception as e:
+                show_info(f"Could not cache search results: {e}")
+        
         return keys
         
     except Exception as e:
         show_error(f"Vector search failed: {e}")
         return []
 
+@functools.lru_cache(maxsize=64)
+def _load_resized(path: str, mtime: float, max_side: int) -> Image.Image:
+    """Decode and downscale a page image once per (path, mtime)"""
+    img = Image.open(path)
+    img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    return img
+
+def _open_and_resize(path: str, max_side: int = 1024) -> Image.Image:
+    """Open an image downscaled so its longest side is at most `max_side`"""
+    # mtime in the key means a re-extracted page is decoded again; copy so callers can't mutate the cached image
+    return _load_resized(path, os.stat(path).st_mtime, max_side).copy()
+
+# Cheap intent check used to skip the LLM tool-selection call on clear-cut queries
+_QUESTION_RE = re.compile(r"\b(what|how|why|when|where|who|explain|show|find|search)\b", re.I)
+
 def complete_generate_answer(user_query: str, images: List = []) -> str:
     """Complete implementation of answer generation"""
     try:
-        # Use tool selection
-        tool_call = select_tool([user_query])
+        if images:
+            # Questions about provided images: let the LLM decide
+            tool_call = select_tool([user_query])
+        elif _QUESTION_RE.search(user_query):
+            # Clear search intent: call the tool directly with the user's query
+            tool_call = types.FunctionCall(
+                name="get_information_for_question_answering",
+                args={"user_query": user_query},
+            )
+        elif len(user_query) < 20:
+            # Short non-question (e.g. a greeting): no tool needed
+            tool_call = None
+        else:
+            tool_call = select_tool([user_query])
         
         if (
             tool_call is not None
@@ -214,7 +393,7 @@ def complete_generate_answer(user_query: str, images: List = []) -> str:
             "DO NOT use any other information to answer the question."
         )
         
-        contents = [system_prompt] + [user_query] + [Image.open(image) for image in images]
+        contents = [system_prompt] + [user_query] + [_open_and_resize(image) for image in images]
 
         response = gemini_client.models.generate_content(
             model=LLM,